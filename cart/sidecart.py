@@ -7,34 +7,192 @@ using environment variables for configuration and connection pooling for
 optimal performance.
 """
 
+import atexit
+import functools
 import os
+import queue
+import re
+import select
 import sys
 import logging
 import signal
+import struct
+import threading
 import time
-from typing import Optional, Dict, Any, List
+import uuid
+from io import BytesIO
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Callable, Dict, Any, Iterator, List, Sequence, Tuple, Union
 from contextlib import contextmanager
 from dataclasses import dataclass
 
 import psycopg2
-from psycopg2 import pool, sql
+from psycopg2 import extensions, pool, sql
 from psycopg2.extras import RealDictCursor
 import psycopg2.errors
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/app/logs/sidecart.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+# Configure logging. Records are put on a queue and written to the log
+# file and stdout by a background listener, keeping I/O off the query path.
+# The log file is rotated at 10 MB, keeping 3 backups.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    RotatingFileHandler('/app/logs/sidecart.log', maxBytes=10 * 1024 * 1024, backupCount=3),
+    logging.StreamHandler(sys.stdout)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+# SimpleQueue.put is reentrant, so logging from a signal handler cannot
+# deadlock on a put the main thread was interrupted in
+_log_queue_handler = QueueHandler(queue.SimpleQueue())
+_log_listener: Optional[QueueListener] = QueueListener(
+    _log_queue_handler.queue, *_log_handlers, respect_handler_level=True
 )
+_log_listener.start()
+
+logging.root.setLevel(logging.INFO)
+logging.root.addHandler(_log_queue_handler)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def stop_logging() -> None:
+    """Flush queued log records and stop the background listener.
+    
+    Any later records are written directly by the underlying handlers.
+    """
+    global _log_listener
+    if _log_listener is None:
+        return
+    
+    _log_listener.stop()
+    _log_listener = None
+    logging.root.removeHandler(_log_queue_handler)
+    for handler in _log_handlers:
+        handler.flush()
+        logging.root.addHandler(handler)
+
+
+atexit.register(stop_logging)
+
+# Queries may be plain SQL strings or psycopg2.sql compositions
+Query = Union[str, sql.Composable]
+
+# Statements accepted by the client-side read-only check
+_READ_ONLY_RE = re.compile(r'\s*(?:SELECT|WITH|SHOW|EXPLAIN)\b', re.IGNORECASE)
+
+# Statements PostgreSQL accepts in DECLARE ... CURSOR (server-side cursors)
+_SERVER_CURSOR_RE = re.compile(r'\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+
+# Columns get_table_info can return, in their default order, mapped to the
+# pg_catalog expressions producing them. Names follow
+# information_schema.columns, but data_type comes from format_type(), so
+# arrays, domains and user-defined types report their actual type name
+# rather than ARRAY or USER-DEFINED. row_estimate is pg_class.reltuples.
+_TABLE_INFO_EXPRESSIONS = {
+    'table_name': "c.relname::text",
+    'column_name': "a.attname::text",
+    'data_type': "format_type(a.atttypid, NULL)",
+    'is_nullable': "CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END",
+    'column_default': "pg_get_expr(d.adbin, d.adrelid)",
+    'row_estimate': "c.reltuples::bigint",
+}
+TABLE_INFO_COLUMNS = tuple(_TABLE_INFO_EXPRESSIONS)
+
+# SQL templates, built once at import rather than on every call. Catalog
+# queries go straight to pg_catalog instead of the information_schema views
+# built on top of it. They cover ordinary and partitioned tables only (no
+# views, materialized views or foreign tables) that the current user can
+# SELECT as a whole; column-level grants alone do not make a table visible.
+# Tables without columns yield one row with a NULL column_name.
+_TABLE_INFO_SQL = """
+SELECT {columns}
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+LEFT JOIN pg_catalog.pg_attribute a
+    ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+LEFT JOIN pg_catalog.pg_attrdef d
+    ON d.adrelid = c.oid AND d.adnum = a.attnum
+WHERE n.nspname = %s AND c.relkind IN ('r', 'p')
+    AND has_table_privilege(c.oid, 'SELECT')
+ORDER BY c.relname, a.attnum
+"""
+
+_ESTIMATED_ROW_COUNTS_SQL = """
+SELECT c.relname AS table_name, c.reltuples::bigint AS row_count
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND c.relname = ANY(%s)
+"""
+
+_ROW_COUNT_SQL = sql.SQL("SELECT {name} AS table_name, COUNT(*) AS row_count FROM {table}")
+_UNION_ALL_SQL = sql.SQL(" UNION ALL ")
+_COPY_BINARY_SQL = sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT binary)")
+
+
+@functools.lru_cache(maxsize=None)
+def _table_info_query(columns: Tuple[str, ...]) -> str:
+    """Render the table information query for a column selection.
+    
+    Columns are validated against TABLE_INFO_COLUMNS by the caller, so they
+    can be inlined without quoting and the text is identical on every call.
+    """
+    return _TABLE_INFO_SQL.format(
+        columns=', '.join(f"{_TABLE_INFO_EXPRESSIONS[column]} AS {column}" for column in columns)
+    )
+
+
+# Header signature of the PostgreSQL binary COPY format
+_COPY_BINARY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+
+
+def parse_copy_binary(data: bytes, columns: Sequence[str], encoding: str = 'utf-8',
+                      decoders: Optional[Dict[str, Callable[[bytes], Any]]] = None
+                      ) -> List[Dict[str, Any]]:
+    """Parse a binary COPY stream into row dicts.
+    
+    Columns are decoded as text unless a decoder for their binary
+    representation is given in decoders.
+    """
+    decoders = decoders or {}
+    if not data.startswith(_COPY_BINARY_SIGNATURE):
+        raise ValueError("Not a binary COPY stream")
+    
+    # Skip signature, flags field and header extension area
+    offset = len(_COPY_BINARY_SIGNATURE) + 4
+    (extension_length,) = struct.unpack_from('!i', data, offset)
+    offset += 4 + extension_length
+    
+    rows = []
+    while True:
+        (field_count,) = struct.unpack_from('!h', data, offset)
+        offset += 2
+        if field_count == -1:
+            break
+        if field_count != len(columns):
+            raise ValueError(f"Expected {len(columns)} fields per row, got {field_count}")
+        
+        row = {}
+        for column in columns:
+            (length,) = struct.unpack_from('!i', data, offset)
+            offset += 4
+            if length == -1:
+                row[column] = None
+            else:
+                value = data[offset:offset + length]
+                decoder = decoders.get(column)
+                row[column] = decoder(value) if decoder else value.decode(encoding)
+                offset += length
+        rows.append(row)
+    
+    return rows
+
+
+# Binary decoders for non-text table information columns
+_TABLE_INFO_DECODERS = {'row_estimate': lambda value: struct.unpack('!q', value)[0]}
+
+
+@dataclass(frozen=True, slots=True)
 class DatabaseConfig:
     """Database configuration from environment variables."""
     host: str
@@ -44,62 +202,123 @@ class DatabaseConfig:
     password: str
     sslmode: str = 'require'
     connect_timeout: int = 10
+    statement_timeout: int = 30000
+    pool_mode: str = 'session'
+    min_connections: int = 1
+    max_connections: int = 5
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def from_env(cls) -> 'DatabaseConfig':
-        """Create configuration from environment variables."""
+        """Create configuration from environment variables.
+        
+        The result is cached, so repeated initializations in the same process
+        reuse it. Call DatabaseConfig.from_env.cache_clear() after changing
+        the environment to pick up new values.
+        """
+        env = os.environ
         required_vars = ['DB_HOST', 'DB_PORT', 'DB_NAME', 'DB_USERNAME', 'DB_PASSWORD']
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = [var for var in required_vars if not env.get(var)]
         
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {missing_vars}")
         
+        pool_mode = env.get('DB_POOL_MODE', 'session')
+        if pool_mode not in ('session', 'transaction'):
+            raise ValueError(f"DB_POOL_MODE must be 'session' or 'transaction', got: {pool_mode}")
+        
         return cls(
-            host=os.getenv('DB_HOST'),
-            port=int(os.getenv('DB_PORT', 5432)),
-            database=os.getenv('DB_NAME'),
-            username=os.getenv('DB_USERNAME'),
-            password=os.getenv('DB_PASSWORD'),
-            sslmode=os.getenv('DB_SSLMODE', 'require'),
-            connect_timeout=int(os.getenv('DB_CONNECT_TIMEOUT', 10))
+            host=env['DB_HOST'],
+            port=int(env['DB_PORT']),
+            database=env['DB_NAME'],
+            username=env['DB_USERNAME'],
+            password=env['DB_PASSWORD'],
+            sslmode=env.get('DB_SSLMODE', 'require'),
+            connect_timeout=int(env.get('DB_CONNECT_TIMEOUT', 10)),
+            statement_timeout=int(env.get('DB_STATEMENT_TIMEOUT', 30000)),
+            pool_mode=pool_mode,
+            min_connections=int(env.get('DB_MIN_CONNECTIONS', 1)),
+            max_connections=int(env.get('DB_MAX_CONNECTIONS', 5))
         )
 
 
 class DatabaseManager:
     """Manages PostgreSQL database connections with connection pooling."""
     
-    def __init__(self, config: DatabaseConfig, min_conn: int = 1, max_conn: int = 5):
+    __slots__ = (
+        'config', 'connection_pool', 'min_conn', 'max_conn',
+        'cache_ttl', '_table_info_cache', '_cache_lock',
+        '_table_info_pending', 'bulk_threshold', '_table_info_sizes',
+    )
+    
+    def __init__(self, config: DatabaseConfig, min_conn: int = 1, max_conn: int = 5,
+                 cache_ttl: float = 300, bulk_threshold: int = 5000):
         self.config = config
         self.connection_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
         self.min_conn = min_conn
         self.max_conn = max_conn
-        self._shutdown = False
+        self.cache_ttl = cache_ttl
+        self._table_info_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._cache_lock = threading.Lock()
+        self._table_info_pending: Dict[Tuple[str, Tuple[str, ...]], threading.Event] = {}
+        self.bulk_threshold = bulk_threshold
+        self._table_info_sizes: Dict[str, int] = {}
         
     def initialize_pool(self) -> None:
         """Initialize the connection pool."""
         try:
-            connection_string = (
-                f"host={self.config.host} "
-                f"port={self.config.port} "
-                f"dbname={self.config.database} "
-                f"user={self.config.username} "
-                f"password={self.config.password} "
-                f"sslmode={self.config.sslmode} "
-                f"connect_timeout={self.config.connect_timeout}"
-            )
+            # Connection parameters are passed as keywords so special characters
+            # in the password need no quoting. TCP keepalives stop idle pooled
+            # connections from being silently dropped, and every session is
+            # read-only with a bounded statement runtime. PgBouncer in
+            # transaction mode rejects the "options" startup parameter, so
+            # those settings must then be applied to the role server-side.
+            session_options = {}
+            if self.config.pool_mode != 'transaction':
+                session_options['options'] = (
+                    f"-c statement_timeout={self.config.statement_timeout} "
+                    "-c default_transaction_read_only=on"
+                )
             
             self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
                 self.min_conn,
                 self.max_conn,
-                connection_string
+                host=self.config.host,
+                port=self.config.port,
+                dbname=self.config.database,
+                user=self.config.username,
+                password=self.config.password,
+                sslmode=self.config.sslmode,
+                connect_timeout=self.config.connect_timeout,
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=5,
+                **session_options
             )
             
-            logger.info(f"Database connection pool initialized (min: {self.min_conn}, max: {self.max_conn})")
+            logger.info("Database connection pool initialized (min: %s, max: %s)", self.min_conn, self.max_conn)
             
         except psycopg2.Error as e:
-            logger.error(f"Failed to initialize database connection pool: {e}")
+            logger.error("Failed to initialize database connection pool: %s", e)
             raise
     
+    def warm_cache(self, columns: Sequence[str] = TABLE_INFO_COLUMNS) -> None:
+        """Prefetch table information for the public schema into the cache.
+        
+        Runs on the calling thread, so it never competes with the caller for
+        a pooled connection; call it once the pool is known to work.
+        """
+        if self.cache_ttl <= 0:
+            return
+        
+        try:
+            tables = self.get_table_info('public', columns=columns)
+            logger.info("Prefetched table information (%s columns)", len(tables))
+        except Exception as e:
+            # Warm-up is best effort; the first real call will fetch again
+            logger.warning("Failed to prefetch table information: %s", e)
+    
     @contextmanager
     def get_connection(self):
         """Get a database connection from the pool."""
@@ -114,7 +333,7 @@ class DatabaseManager:
             else:
                 raise RuntimeError("Failed to get connection from pool")
         except psycopg2.Error as e:
-            logger.error(f"Database connection error: {e}")
+            logger.error("Database connection error: %s", e)
             raise
         finally:
             if connection:
@@ -123,47 +342,253 @@ class DatabaseManager:
     def test_connection(self) -> bool:
         """Test database connectivity."""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("SELECT 1")
-                    result = cursor.fetchone()
-                    logger.info("Database connection test successful")
-                    return result[0] == 1
+            result = self.execute_query("SELECT 1 AS ok")
+            logger.info("Database connection test successful")
+            return result[0]['ok'] == 1
         except Exception as e:
-            logger.error(f"Database connection test failed: {e}")
+            logger.error("Database connection test failed: %s", e)
             return False
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
-        """Execute a read-only query safely."""
-        # Ensure query is read-only (basic check)
-        query_upper = query.strip().upper()
-        if not query_upper.startswith(('SELECT', 'WITH', 'SHOW', 'EXPLAIN')):
+    def _render_query(self, conn, query: Query) -> str:
+        """Render a query to SQL text and ensure it is read-only."""
+        if isinstance(query, sql.Composable):
+            query = query.as_string(conn)
+        
+        # Ensure query is read-only (basic check). Sessions are also opened
+        # read-only server-side, except behind PgBouncer in transaction mode.
+        if not _READ_ONLY_RE.match(query):
             raise ValueError("Only read-only queries are allowed")
         
+        return query
+    
+    def execute_query(self, query: Query, params: Optional[tuple] = None,
+                      stream: bool = False,
+                      batch_size: int = 1000,
+                      connection: Optional[extensions.connection] = None
+                      ) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+        """Execute a read-only query safely.
+        
+        Pass a connection already taken from get_connection() to run several
+        related queries on it without going back to the pool for each one.
+        
+        With stream=True an iterator is returned instead of a list (see
+        execute_query_iter). Rows are read batch_size at a time, through a
+        server-side cursor for SELECT and WITH queries, so memory is bounded
+        by the batch rather than the full result. The connection is held
+        until the iterator is exhausted or closed.
+        """
+        if stream:
+            return self.execute_query_iter(query, params, batch=batch_size, connection=connection)
+        
+        try:
+            if connection is not None:
+                return self._fetch_all(connection, query, params)
+            with self.get_connection() as conn:
+                return self._fetch_all(conn, query, params)
+        except psycopg2.Error as e:
+            logger.error("Query execution failed: %s", e)
+            raise
+    
+    def _fetch_all(self, conn: extensions.connection, query: Query,
+                   params: Optional[tuple]) -> List[Dict[str, Any]]:
+        """Run a query on the given connection and fetch every row."""
+        query = self._render_query(conn, query)
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            # RealDictRow is already a dict subclass; no need to copy
+            return cursor.fetchall()
+    
+    def execute_query_iter(self, query: Query, params: Optional[tuple] = None,
+                           batch: int = 500,
+                           connection: Optional[extensions.connection] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the rows of a read-only query, fetching batch rows at a time.
+        
+        SELECT and WITH queries read from a named (server-side) cursor, so
+        only one batch is held in memory and callers that stop early never
+        transfer the rest. SHOW and EXPLAIN cannot be declared as cursors and
+        use a regular cursor, whose result is transferred in full.
+        
+        Pass a connection from get_connection() to run on it; otherwise a
+        pooled connection is held until the iterator is exhausted or closed.
+        Wrap the iterator in contextlib.closing() when not consuming it fully.
+        """
+        try:
+            if connection is not None:
+                yield from self._iter_rows(connection, query, params, batch)
+            else:
+                with self.get_connection() as conn:
+                    yield from self._iter_rows(conn, query, params, batch)
+        except psycopg2.Error as e:
+            logger.error("Query execution failed: %s", e)
+            raise
+    
+    def _iter_rows(self, conn: extensions.connection, query: Query, params: Optional[tuple],
+                   batch: int) -> Iterator[Dict[str, Any]]:
+        """Yield query rows from the given connection in batches."""
+        query = self._render_query(conn, query)
+        name = f"sc_{uuid.uuid4().hex}" if _SERVER_CURSOR_RE.match(query) else None
+        with conn.cursor(name=name, cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            while rows := cursor.fetchmany(batch):
+                yield from rows
+    
+    def bulk_query(self, query: Query, params: Optional[tuple] = None,
+                   connection: Optional[extensions.connection] = None) -> bytes:
+        """Run a read-only query through COPY ... TO STDOUT in binary format.
+        
+        Returns the raw COPY stream, which avoids the per-row protocol
+        messages and Python row construction of a regular fetch. Use
+        parse_copy_binary() to decode the stream; text in it is in the
+        connection's client encoding.
+        """
+        return self._bulk_copy(query, params, connection)[0]
+    
+    def _bulk_copy(self, query: Query, params: Optional[tuple],
+                   connection: Optional[extensions.connection]) -> Tuple[bytes, str]:
+        """Run a binary COPY and return the stream with its Python text codec."""
         try:
+            if connection is not None:
+                return self._copy_binary(connection, query, params)
             with self.get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute(query, params)
-                    results = cursor.fetchall()
-                    return [dict(row) for row in results]
+                return self._copy_binary(conn, query, params)
         except psycopg2.Error as e:
-            logger.error(f"Query execution failed: {e}")
+            logger.error("Bulk query failed: %s", e)
             raise
     
-    def get_table_info(self, schema: str = 'public') -> List[Dict[str, Any]]:
-        """Get information about tables in the specified schema."""
-        query = """
-        SELECT 
-            table_name,
-            column_name,
-            data_type,
-            is_nullable,
-            column_default
-        FROM information_schema.columns 
-        WHERE table_schema = %s
-        ORDER BY table_name, ordinal_position
+    def _copy_binary(self, conn: extensions.connection, query: Query,
+                     params: Optional[tuple]) -> Tuple[bytes, str]:
+        """Copy the result of a query on the given connection into memory."""
+        query = self._render_query(conn, query)
+        encoding = extensions.encodings[conn.encoding]
+        buffer = BytesIO()
+        with conn.cursor() as cursor:
+            if params:
+                # COPY takes no bind parameters, so inline them client-side
+                query = cursor.mogrify(query, params).decode(encoding)
+            cursor.copy_expert(
+                _COPY_BINARY_SQL.format(sql.SQL(query)),
+                buffer
+            )
+        return buffer.getvalue(), encoding
+    
+    def get_table_info(self, schema: str = 'public',
+                       stream: bool = False,
+                       connection: Optional[extensions.connection] = None,
+                       columns: Sequence[str] = TABLE_INFO_COLUMNS
+                       ) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+        """Get information about tables in the specified schema.
+        
+        Rows come from a single pg_catalog query with one row per column
+        (plus row_estimate, the planner's row count for the table). Only the
+        requested columns (a subset of TABLE_INFO_COLUMNS) are selected, so
+        callers do not pay for values they never read.
+        
+        Unlike information_schema.columns, the result only covers ordinary
+        and partitioned tables (not views, materialized views or foreign
+        tables) on which the current user has table-level SELECT; tables
+        visible only through column-level grants are left out. data_type is
+        the format_type() name, so arrays, domains and user-defined types
+        are reported by their actual type. Tables without columns yield one
+        row with a None column_name.
+        
+        Results are cached per schema and column selection for cache_ttl
+        seconds, since schema metadata only changes on DDL. Call
+        invalidate_cache() after schema changes to see them sooner.
+        Concurrent calls for the same key share a single fetch. Each call
+        gets a new list, but the row dicts in it are shared with the cache
+        and other callers, so treat them as read-only. Pass
+        stream=True to iterate over the columns without materializing the
+        whole result (see execute_query); streamed results bypass the cache.
+        
+        Once a schema has been seen to have more than bulk_threshold
+        columns, later fetches use a binary COPY (see bulk_query).
         """
-        return self.execute_query(query, (schema,))
+        columns = tuple(columns)
+        unknown_columns = set(columns) - set(TABLE_INFO_COLUMNS)
+        if not columns or unknown_columns:
+            raise ValueError(f"Columns must be a non-empty subset of {TABLE_INFO_COLUMNS}, got: {columns}")
+        
+        query = _table_info_query(columns)
+        if stream:
+            return self.execute_query(query, (schema,), stream=True, connection=connection)
+        
+        if self.cache_ttl <= 0:
+            return self._fetch_table_info(schema, columns, connection)
+        
+        cache_key = (schema, columns)
+        while True:
+            with self._cache_lock:
+                cached = self._table_info_cache.get(cache_key)
+                if cached and cached[0] > time.monotonic():
+                    return list(cached[1])
+                pending = self._table_info_pending.get(cache_key)
+                if pending is None:
+                    pending = self._table_info_pending[cache_key] = threading.Event()
+                    break
+            # Another thread is already fetching this key; wait for it and
+            # re-check, fetching here only if that fetch failed
+            pending.wait()
+        
+        try:
+            results = self._fetch_table_info(schema, columns, connection)
+            with self._cache_lock:
+                self._table_info_cache[cache_key] = (time.monotonic() + self.cache_ttl, results)
+            return list(results)
+        finally:
+            with self._cache_lock:
+                del self._table_info_pending[cache_key]
+            pending.set()
+    
+    def _fetch_table_info(self, schema: str, columns: Tuple[str, ...],
+                          connection: Optional[extensions.connection]) -> List[Dict[str, Any]]:
+        """Fetch table information from the server, bypassing the cache."""
+        query = _table_info_query(columns)
+        if self._table_info_sizes.get(schema, 0) > self.bulk_threshold:
+            data, encoding = self._bulk_copy(query, (schema,), connection)
+            results = parse_copy_binary(data, columns, encoding=encoding, decoders=_TABLE_INFO_DECODERS)
+        else:
+            results = self.execute_query(query, (schema,), connection=connection)
+        
+        with self._cache_lock:
+            self._table_info_sizes[schema] = len(results)
+        return results
+    
+    def invalidate_cache(self, schema: Optional[str] = None) -> None:
+        """Drop cached table information for one schema, or for all schemas."""
+        with self._cache_lock:
+            if schema is None:
+                self._table_info_cache.clear()
+            else:
+                for key in [key for key in self._table_info_cache if key[0] == schema]:
+                    del self._table_info_cache[key]
+    
+    def get_row_counts(self, table_names: Sequence[str], schema: str = 'public',
+                       exact: bool = True,
+                       connection: Optional[extensions.connection] = None) -> Dict[str, int]:
+        """Get row counts for the given tables in a single round trip.
+        
+        With exact=True the counts come from one UNION ALL of COUNT(*)
+        queries. With exact=False they are the planner estimates from
+        pg_class.reltuples, which avoids scanning the tables at all but is
+        only as fresh as the last VACUUM/ANALYZE (-1 if never analyzed).
+        """
+        if not table_names:
+            return {}
+        
+        if exact:
+            query = _UNION_ALL_SQL.join(
+                _ROW_COUNT_SQL.format(
+                    name=sql.Literal(table_name),
+                    table=sql.Identifier(schema, table_name)
+                )
+                for table_name in table_names
+            )
+            results = self.execute_query(query, connection=connection)
+        else:
+            results = self.execute_query(_ESTIMATED_ROW_COUNTS_SQL, (schema, list(table_names)),
+                                         connection=connection)
+        
+        return {row['table_name']: row['row_count'] for row in results}
     
     def close_pool(self) -> None:
         """Close all connections in the pool."""
@@ -175,18 +600,40 @@ class DatabaseManager:
 class SideCartApp:
     """Main application class for SideCart."""
     
-    def __init__(self):
+    # Table information columns read by run_sample_queries
+    SAMPLE_COLUMNS = ('table_name', 'column_name', 'data_type')
+    
+    def __init__(self, heartbeat_interval: float = 300):
         self.db_manager: Optional[DatabaseManager] = None
-        self._shutdown = False
+        self.heartbeat_interval = heartbeat_interval
+        self._shutdown_requested = False
         
-        # Setup signal handlers for graceful shutdown
+        # Setup signal handlers for graceful shutdown. The handler only sets
+        # a flag: it runs on the main thread between bytecodes, so taking a
+        # lock there (e.g. threading.Event.set) can deadlock against the
+        # interrupted code. The interpreter also writes each signal to the
+        # wakeup pipe, which wakes the main loop's select().
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_write, False)
+        signal.set_wakeup_fd(self._wakeup_write)
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
-        logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-        self._shutdown = True
+        logger.info("Received signal %s, initiating graceful shutdown...", signum)
+        self._shutdown_requested = True
+    
+    def _wait_for_shutdown(self, timeout: float) -> bool:
+        """Sleep until a shutdown signal arrives or timeout elapses.
+        
+        Returns True once shutdown has been requested.
+        """
+        if not self._shutdown_requested:
+            ready, _, _ = select.select([self._wakeup_read], [], [], timeout)
+            if ready:
+                os.read(self._wakeup_read, 512)
+        return self._shutdown_requested
     
     def initialize(self) -> None:
         """Initialize the application."""
@@ -195,20 +642,27 @@ class SideCartApp:
             
             # Load configuration
             config = DatabaseConfig.from_env()
-            logger.info(f"Loaded configuration for database: {config.host}:{config.port}/{config.database}")
+            logger.info("Loaded configuration for database: %s:%s/%s", config.host, config.port, config.database)
             
             # Initialize database manager
-            self.db_manager = DatabaseManager(config)
+            self.db_manager = DatabaseManager(
+                config,
+                min_conn=config.min_connections,
+                max_conn=config.max_connections
+            )
             self.db_manager.initialize_pool()
             
             # Test connection
             if not self.db_manager.test_connection():
                 raise RuntimeError("Database connection test failed")
             
+            # Prefetch the metadata run_sample_queries reads
+            self.db_manager.warm_cache(self.SAMPLE_COLUMNS)
+            
             logger.info("SideCart application initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize application: {e}")
+            logger.error("Failed to initialize application: %s", e)
             raise
     
     def run_sample_queries(self) -> None:
@@ -217,43 +671,37 @@ class SideCartApp:
             raise RuntimeError("Database manager not initialized")
         
         try:
-            # Get table information
-            logger.info("Fetching table information...")
-            tables = self.db_manager.get_table_info()
-            
-            if tables:
-                logger.info(f"Found {len(tables)} columns across all tables")
-                for table in tables:
-                    logger.info(f"Table: {table['table_name']}, Column: {table['column_name']}, Type: {table['data_type']}")
-            else:
-                logger.info("No tables found in the database")
-            
-            # Sample query (adjust based on your actual tables)
-            logger.info("Attempting to query existing tables...")
-            
-            # Get list of tables first
-            table_query = """
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
-            """
-            
-            table_list = self.db_manager.execute_query(table_query)
-            
-            if table_list:
-                for table_info in table_list:
-                    table_name = table_info['table_name']
-                    logger.info(f"Querying table: {table_name}")
-                    
-                    # Count rows in table
-                    count_query = f"SELECT COUNT(*) as row_count FROM {table_name}"
-                    count_result = self.db_manager.execute_query(count_query)
-                    logger.info(f"Table {table_name} has {count_result[0]['row_count']} rows")
-            else:
-                logger.info("No tables found to query")
-            
+            # Run all sample queries on a single pooled connection
+            with self.db_manager.get_connection() as conn:
+                # Get table information
+                logger.info("Fetching table information...")
+                tables = self.db_manager.get_table_info(connection=conn, columns=self.SAMPLE_COLUMNS)
+                
+                if not tables:
+                    logger.info("No tables found in the database")
+                    return
+                
+                # Tables without columns come back with a NULL column_name
+                columns = [table for table in tables if table['column_name'] is not None]
+                logger.info("Found %s columns across all tables", len(columns))
+                for table in columns:
+                    logger.info("Table: %s, Column: %s, Type: %s", table['table_name'], table['column_name'], table['data_type'])
+                
+                # Sample query (adjust based on your actual tables)
+                logger.info("Attempting to query existing tables...")
+                
+                # Table names come from the rows already fetched (ordered by
+                # table), so no second catalog query is needed
+                table_names = list(dict.fromkeys(table['table_name'] for table in tables))
+                logger.info("Querying tables: %s", ', '.join(table_names))
+                
+                # Count rows in all tables with a single query
+                row_counts = self.db_manager.get_row_counts(table_names, connection=conn)
+                for table_name in table_names:
+                    logger.info("Table %s has %s rows", table_name, row_counts[table_name])
+                
         except Exception as e:
-            logger.error(f"Error running sample queries: {e}")
+            logger.error("Error running sample queries: %s", e)
     
     def run(self) -> None:
         """Main application loop."""
@@ -263,20 +711,21 @@ class SideCartApp:
             # Run sample queries
             self.run_sample_queries()
             
-            # Main application loop
-            while not self._shutdown:
+            # Main application loop. The thread sleeps until a shutdown signal
+            # wakes it, waking otherwise only to log a periodic heartbeat.
+            logger.info("SideCart is running... (Press Ctrl+C to stop)")
+            while not self._wait_for_shutdown(self.heartbeat_interval):
                 # In a real application, this would be where you:
                 # - Listen for API requests
                 # - Process scheduled tasks
                 # - Handle database queries
                 
                 logger.info("SideCart is running... (Press Ctrl+C to stop)")
-                time.sleep(30)  # Check every 30 seconds
                 
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
         except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}")
+            logger.error("Unexpected error in main loop: %s", e)
         finally:
             self.shutdown()
     
@@ -288,6 +737,7 @@ class SideCartApp:
             self.db_manager.close_pool()
         
         logger.info("SideCart application shutdown complete")
+        stop_logging()
 
 
 def main():
@@ -297,7 +747,7 @@ def main():
         app.initialize()
         app.run()
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
 
 